@@ -45,8 +45,10 @@ class TXTGenerator(Generator):
     def loads(text):
         user_defines_index = text.find("[USER_")
         env_defines_index = text.find("[ENV_")
+        # The cpp_info section is the largest one, it is parsed in place up to its end index
+        # instead of copying it to a new string
         if user_defines_index != -1:
-            deps_cpp_info_txt = text[:user_defines_index]
+            deps_cpp_info_end = user_defines_index
             if env_defines_index != -1:
                 user_info_txt = text[user_defines_index:env_defines_index]
                 deps_env_info_txt = text[env_defines_index:]
@@ -55,15 +57,15 @@ class TXTGenerator(Generator):
                 deps_env_info_txt = ""
         else:
             if env_defines_index != -1:
-                deps_cpp_info_txt = text[:env_defines_index]
+                deps_cpp_info_end = env_defines_index
                 deps_env_info_txt = text[env_defines_index:]
             else:
-                deps_cpp_info_txt = text
+                deps_cpp_info_end = len(text)
                 deps_env_info_txt = ""
 
             user_info_txt = ""
 
-        deps_cpp_info = TXTGenerator._loads_cpp_info(deps_cpp_info_txt)
+        deps_cpp_info = TXTGenerator._loads_cpp_info(text, deps_cpp_info_end)
         deps_user_info = TXTGenerator._loads_deps_user_info(user_info_txt)
         deps_env_info = DepsEnvInfo.loads(deps_env_info_txt)
         return deps_cpp_info, deps_user_info, deps_env_info
@@ -85,13 +87,13 @@ class TXTGenerator(Generator):
         return ret
 
     @staticmethod
-    def _loads_cpp_info(text):
+    def _loads_cpp_info(text, end):
         pattern = re.compile(r"^\[([a-zA-Z0-9._:-]+)\]([^\[]+)", re.MULTILINE)
 
         try:
             # Parse the text
             data = defaultdict(lambda: defaultdict(dict))
-            for m in pattern.finditer(text):
+            for m in pattern.finditer(text, 0, end):
                 var_name = m.group(1)
                 lines = []
                 for line in m.group(2).splitlines():
@@ -287,7 +287,13 @@ class GraphBinariesAnalyzer(object):
                         n.binary = BINARY_SKIP
                         self._handle_private(n)
 
-    def evaluate_graph(self, deps_graph, build_mode, update, remotes):
+    def evaluate_graph(self, deps_graph, build_mode, update, remotes, skip_binaries=False):
+        """
+        :param skip_binaries: Only compute the package_ids, do not look for the binaries in the
+            cache or remotes. The nodes forced to build by the build_mode are marked as
+            BINARY_BUILD and the editable ones as BINARY_EDITABLE (so their build_requires are
+            expanded), the rest as BINARY_SKIP
+        """
         default_package_id_mode = self._cache.config.default_package_id_mode
         for node in deps_graph.ordered_iterate():
             self._propagate_options(node)
@@ -297,7 +303,14 @@ class GraphBinariesAnalyzer(object):
             if node.package_id == PACKAGE_ID_UNKNOWN:
                 assert node.binary is None
                 continue
-            self._evaluate_node(node, build_mode, update, remotes)
+            if skip_binaries:
+                if node.recipe == RECIPE_EDITABLE:
+                    node.binary = BINARY_EDITABLE
+                # Missing binaries cannot be known, only the forced builds are built
+                elif not self._evaluate_build(node, build_mode):
+                    node.binary = BINARY_SKIP
+            else:
+                self._evaluate_node(node, build_mode, update, remotes)
             self._handle_private(node)
 
     def reevaluate_node(self, node, remotes, build_mode, update):
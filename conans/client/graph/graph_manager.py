@@ -1,6 +1,7 @@
 import fnmatch
 import os
-from collections import OrderedDict
+import re
+from collections import OrderedDict, defaultdict
 
 from conans.client.generators.text import TXTGenerator
 from conans.client.graph.build_mode import BuildMode
@@ -9,7 +10,7 @@ from conans.client.graph.graph import BINARY_BUILD, Node,\
 from conans.client.graph.graph_builder import DepsGraphBuilder
 from conans.errors import ConanException, conanfile_exception_formatter
 from conans.model.conan_file import get_env_context_manager
-from conans.model.graph_info import GraphInfo
+from conans.model.graph_info import GRAPH_INFO_FILE, GraphInfo
 from conans.model.graph_lock import GraphLock, GraphLockFile
 from conans.model.ref import ConanFileReference
 from conans.paths import BUILD_INFO
@@ -17,6 +18,8 @@ from conans.util.files import load
 from conans.model.info import PACKAGE_ID_UNKNOWN
 
 
+# Not a plain dict: the declaration order defines the order in which the build_requires are
+# expanded in the graph, and Python 2 (still supported) dicts do not keep insertion order
 class _RecipeBuildRequires(OrderedDict):
     def __init__(self, conanfile):
         super(_RecipeBuildRequires, self).__init__()
@@ -39,7 +42,60 @@ class _RecipeBuildRequires(OrderedDict):
             self.add(build_require)
 
     def __str__(self):
-        return ", ".join(str(r) for r in self.values())
+        return ", ".join([str(r) for r in self.values()])
+
+
+class _ProfileBuildRequires(object):
+    """ The profile build_requires {pattern: [refs]}, preprocessed once per graph: patterns
+    without wildcards are resolved with a dict lookup, and only the real glob patterns are
+    matched (with a precompiled regex) against every node
+    """
+    def __init__(self, profile_build_requires):
+        # All of them store the index of the pattern, to keep the profile order
+        self._consumer = []  # "&" pattern: [(index, build_requires)]
+        self._non_consumer = []  # "&!" pattern: [(index, build_requires)]
+        self._literals = {}  # {normcase(ref): [(index, build_requires)]}
+        self._globs = []  # [(index, regex, build_requires)]
+        for index, (pattern, build_requires) in enumerate((profile_build_requires or {}).items()):
+            if pattern == "&":
+                self._consumer.append((index, build_requires))
+            elif pattern == "&!":
+                self._non_consumer.append((index, build_requires))
+            elif any(c in pattern for c in "*?["):
+                # normcase() as fnmatch.fnmatch() does
+                regex = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+                self._globs.append((index, regex, build_requires))
+            else:
+                self._literals.setdefault(os.path.normcase(pattern), []).append((index,
+                                                                                 build_requires))
+
+    def __bool__(self):
+        return bool(self._consumer or self._non_consumer or self._literals or self._globs)
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def matching(self, ref, consumer):
+        """ the lists of build_requires of the patterns matching the node, in profile order
+        """
+        str_ref = os.path.normcase(str(ref))
+        result = list(self._consumer if consumer else self._non_consumer)
+        result.extend(self._literals.get(str_ref, ()))
+        result.extend((index, build_requires) for index, regex, build_requires in self._globs
+                      if regex.match(str_ref))
+        if len(result) > 1:
+            result.sort(key=lambda item: item[0])
+        return [build_requires for _, build_requires in result]
+
+
+_NO_PROFILE_BUILD_REQUIRES = _ProfileBuildRequires(None)
+
+# The binaries that are built locally, and thus need their build_requires
+_BUILD_BINARIES = frozenset((BINARY_BUILD, BINARY_EDITABLE))
+
+# Shared result for the recipes without build_requires, it is never modified, as the profile
+# build_requires can only override already existing entries
+_NO_BUILD_REQUIRES = _RecipeBuildRequires(None)
 
 
 class GraphManager(object):
@@ -56,24 +112,26 @@ class GraphManager(object):
                                 deps_info_required=False, test=None):
         """loads a conanfile for local flow: source, imports, package, build
         """
-        try:
+        # Check the file instead of catching the IOError, a missing file is the common case
+        if info_folder and os.path.isfile(os.path.join(info_folder, GRAPH_INFO_FILE)):
             graph_info = GraphInfo.load(info_folder)
             graph_lock_file = GraphLockFile.load(info_folder, self._cache.config.revisions_enabled)
             graph_lock = graph_lock_file.graph_lock
             self._output.info("Using lockfile: '{}/conan.lock'".format(info_folder))
             profile = graph_lock_file.profile
             self._output.info("Using cached profile from lockfile")
-        except IOError:  # Only if file is missing
+            name, version, user, channel, _ = graph_info.root
+            # The lockfile settings were already preprocessed, but processed_settings is still
+            # needed by the loader to create the conanfiles settings, so it cannot be skipped
+            profile.process_settings(self._cache, preprocess=False)
+            # This is the hack of recovering the options from the graph_info
+            profile.options.update(graph_info.options)
+        else:
             graph_lock = None
             # This is very dirty, should be removed for Conan 2.0 (source() method only)
             profile = self._cache.default_profile
             profile.process_settings(self._cache)
             name, version, user, channel = None, None, None, None
-        else:
-            name, version, user, channel, _ = graph_info.root
-            profile.process_settings(self._cache, preprocess=False)
-            # This is the hack of recovering the options from the graph_info
-            profile.options.update(graph_info.options)
         processed_profile = profile
         if conanfile_path.endswith(".py"):
             lock_python_requires = None
@@ -100,9 +158,22 @@ class GraphManager(object):
 
         return conanfile
 
-    def load_graph(self, reference, create_reference, graph_info, build_mode, check_updates, update,
-                   remotes, recorder, apply_build_requires=True):
-
+    def _load_graph_from_virtual_list(self, references, processed_profile):
+        conanfile = self._loader.load_virtual(references, processed_profile, scope_options=False)
+        return Node(None, conanfile, recipe=RECIPE_VIRTUAL)
+
+    def _load_graph_from_ref(self, reference, processed_profile, graph_lock):
+        if not self._cache.config.revisions_enabled and reference.revision is not None:
+            raise ConanException("Revisions not enabled in the client, specify a "
+                                 "reference without revision")
+        # create without test_package and install <ref>
+        conanfile = self._loader.load_virtual([reference], processed_profile)
+        root_node = Node(None, conanfile, recipe=RECIPE_VIRTUAL)
+        if graph_lock:  # Find the Node ID in the lock of current root
+            graph_lock.find_consumer_node(root_node, reference)
+        return root_node
+
+    def _load_graph_from_py(self, path, create_reference, graph_info, processed_profile):
         def _inject_require(conanfile, ref):
             """ test_package functionality requires injecting the tested package as requirement
             before running the install
@@ -115,63 +186,63 @@ class GraphManager(object):
             conanfile._conan_user = ref.user
             conanfile._conan_channel = ref.channel
 
+        graph_lock = graph_info.graph_lock
+        test = str(create_reference) if create_reference else None
+        lock_python_requires = None
+        # do not try apply lock_python_requires for test_package/conanfile.py consumer
+        if graph_lock and not create_reference:
+            if graph_info.root.name is None:
+                # If the graph_info information is not there, better get what we can from
+                # the conanfile
+                conanfile = self._loader.load_class(path)
+                graph_info.root = ConanFileReference(graph_info.root.name or conanfile.name,
+                                                     graph_info.root.version or conanfile.version,
+                                                     graph_info.root.user,
+                                                     graph_info.root.channel, validate=False)
+            node_id = graph_lock.get_node(graph_info.root)
+            lock_python_requires = graph_lock.python_requires(node_id)
+
+        conanfile = self._loader.load_consumer(path, processed_profile, test=test,
+                                               name=graph_info.root.name,
+                                               version=graph_info.root.version,
+                                               user=graph_info.root.user,
+                                               channel=graph_info.root.channel,
+                                               lock_python_requires=lock_python_requires)
+        if create_reference:  # create with test_package
+            _inject_require(conanfile, create_reference)
+
+        ref = ConanFileReference(conanfile.name, conanfile.version,
+                                 conanfile._conan_user, conanfile._conan_channel,
+                                 validate=False)
+        root_node = Node(ref, conanfile, recipe=RECIPE_CONSUMER, path=path)
+        if graph_lock:  # Find the Node ID in the lock of current root
+            graph_lock.find_consumer_node(root_node, create_reference)
+        return root_node
+
+    def _load_graph_from_txt(self, path, create_reference, graph_info, processed_profile):
+        conanfile = self._loader.load_conanfile_txt(path, processed_profile, ref=graph_info.root)
+        root_node = Node(None, conanfile, recipe=RECIPE_CONSUMER, path=path)
+        if graph_info.graph_lock:  # Find the Node ID in the lock of current root
+            graph_info.graph_lock.find_consumer_node(root_node, create_reference)
+        return root_node
+
+    def load_graph(self, reference, create_reference, graph_info, build_mode, check_updates, update,
+                   remotes, recorder, apply_build_requires=True, skip_binaries=False):
         # Computing the full dependency graph
         profile = graph_info.profile
         processed_profile = profile
         processed_profile.dev_reference = create_reference
-        ref = None
         graph_lock = graph_info.graph_lock
         if isinstance(reference, list):  # Install workspace with multiple root nodes
-            conanfile = self._loader.load_virtual(reference, processed_profile,
-                                                  scope_options=False)
-            root_node = Node(ref, conanfile, recipe=RECIPE_VIRTUAL)
+            root_node = self._load_graph_from_virtual_list(reference, processed_profile)
         elif isinstance(reference, ConanFileReference):
-            if not self._cache.config.revisions_enabled and reference.revision is not None:
-                raise ConanException("Revisions not enabled in the client, specify a "
-                                     "reference without revision")
-            # create without test_package and install <ref>
-            conanfile = self._loader.load_virtual([reference], processed_profile)
-            root_node = Node(ref, conanfile, recipe=RECIPE_VIRTUAL)
-            if graph_lock:  # Find the Node ID in the lock of current root
-                graph_lock.find_consumer_node(root_node, reference)
+            root_node = self._load_graph_from_ref(reference, processed_profile, graph_lock)
+        elif reference.endswith(".py"):
+            root_node = self._load_graph_from_py(reference, create_reference, graph_info,
+                                                 processed_profile)
         else:
-            path = reference
-            if path.endswith(".py"):
-                test = str(create_reference) if create_reference else None
-                lock_python_requires = None
-                # do not try apply lock_python_requires for test_package/conanfile.py consumer
-                if graph_lock and not create_reference:
-                    if graph_info.root.name is None:
-                        # If the graph_info information is not there, better get what we can from
-                        # the conanfile
-                        conanfile = self._loader.load_class(path)
-                        graph_info.root = ConanFileReference(graph_info.root.name or conanfile.name,
-                                                             graph_info.root.version or conanfile.version,
-                                                             graph_info.root.user,
-                                                             graph_info.root.channel, validate=False)
-                    node_id = graph_lock.get_node(graph_info.root)
-                    lock_python_requires = graph_lock.python_requires(node_id)
-
-                conanfile = self._loader.load_consumer(path, processed_profile, test=test,
-                                                       name=graph_info.root.name,
-                                                       version=graph_info.root.version,
-                                                       user=graph_info.root.user,
-                                                       channel=graph_info.root.channel,
-                                                       lock_python_requires=lock_python_requires)
-                if create_reference:  # create with test_package
-                    _inject_require(conanfile, create_reference)
-
-                ref = ConanFileReference(conanfile.name, conanfile.version,
-                                         conanfile._conan_user, conanfile._conan_channel,
-                                         validate=False)
-            else:
-                conanfile = self._loader.load_conanfile_txt(path, processed_profile,
-                                                            ref=graph_info.root)
-
-            root_node = Node(ref, conanfile, recipe=RECIPE_CONSUMER, path=path)
-
-            if graph_lock:  # Find the Node ID in the lock of current root
-                graph_lock.find_consumer_node(root_node, create_reference)
+            root_node = self._load_graph_from_txt(reference, create_reference, graph_info,
+                                                  processed_profile)
 
         build_mode = BuildMode(build_mode, self._output)
         deps_graph = self._load_graph(root_node, check_updates, update,
@@ -180,13 +251,13 @@ class GraphManager(object):
                                       recorder=recorder,
                                       processed_profile=processed_profile,
                                       apply_build_requires=apply_build_requires,
-                                      graph_lock=graph_lock)
+                                      graph_lock=graph_lock, skip_binaries=skip_binaries)
 
         # THIS IS NECESSARY to store dependencies options in profile, for consumer
         # FIXME: This is a hack. Might dissapear if graph for local commands is always recomputed
         graph_info.options = root_node.conanfile.options.values
-        if ref:
-            graph_info.root = ref
+        if root_node.ref:
+            graph_info.root = root_node.ref
         if graph_info.graph_lock is None:
             graph_info.graph_lock = GraphLock(deps_graph)
         else:
@@ -204,6 +275,10 @@ class GraphManager(object):
 
     @staticmethod
     def _get_recipe_build_requires(conanfile):
+        if (not getattr(conanfile, "build_requires", None) and
+                not hasattr(conanfile, "build_requirements")):
+            return _NO_BUILD_REQUIRES
+
         conanfile.build_requires = _RecipeBuildRequires(conanfile)
         if hasattr(conanfile, "build_requirements"):
             with get_env_context_manager(conanfile):
@@ -214,44 +289,55 @@ class GraphManager(object):
 
     def _recurse_build_requires(self, graph, subgraph, builder, check_updates,
                                 update, build_mode, remotes, profile_build_requires, recorder,
-                                processed_profile, graph_lock, apply_build_requires=True):
+                                processed_profile, graph_lock, apply_build_requires=True,
+                                skip_binaries=False):
         """
         :param graph: This is the full dependency graph with all nodes from all recursions
         :param subgraph: A partial graph of the nodes that need to be evaluated and expanded
             at this recursion. Only the nodes belonging to this subgraph will get their package_id
             computed, and they will resolve build_requires if they need to be built from sources
+        :param profile_build_requires: _ProfileBuildRequires to apply to the subgraph nodes
+        :param skip_binaries: Only compute the package_ids, do not look for the binaries in the
+            cache or remotes. Only the nodes forced to build by the build_mode get their
+            build_requires expanded, the rest are marked as BINARY_SKIP
         """
 
-        self._binary_analyzer.evaluate_graph(subgraph, build_mode, update, remotes)
+        self._binary_analyzer.evaluate_graph(subgraph, build_mode, update, remotes,
+                                             skip_binaries=skip_binaries)
         if not apply_build_requires:
             return
 
+        # Sequential: build_requirements() modifies os.environ and the full graph is shared
         for node in subgraph.ordered_iterate():
             # Virtual conanfiles doesn't have output, but conanfile.py and conanfile.txt do
             # FIXME: To be improved and build a explicit model for this
-            if node.recipe == RECIPE_VIRTUAL:
+            recipe = node.recipe
+            if recipe == RECIPE_VIRTUAL:
                 continue
+            consumer = recipe == RECIPE_CONSUMER
             # Packages with PACKAGE_ID_UNKNOWN might be built in the future, need build requires
-            if (node.binary not in (BINARY_BUILD, BINARY_EDITABLE)
-                    and node.recipe != RECIPE_CONSUMER and node.package_id != PACKAGE_ID_UNKNOWN):
+            if (node.binary not in _BUILD_BINARIES
+                    and not consumer and node.package_id != PACKAGE_ID_UNKNOWN):
                 continue
             package_build_requires = self._get_recipe_build_requires(node.conanfile)
-            str_ref = str(node.ref)
+            if not package_build_requires and not profile_build_requires:
+                continue
             new_profile_build_requires = []
-            profile_build_requires = profile_build_requires or {}
-            for pattern, build_requires in profile_build_requires.items():
-                if ((node.recipe == RECIPE_CONSUMER and pattern == "&") or
-                        (node.recipe != RECIPE_CONSUMER and pattern == "&!") or
-                        fnmatch.fnmatch(str_ref, pattern)):
-                    for build_require in build_requires:
-                        if build_require.name in package_build_requires:  # Override defined
-                            # this is a way to have only one package Name for all versions
-                            # (no conflicts)
-                            # but the dict key is not used at all
-                            package_build_requires[build_require.name] = build_require
-                        elif build_require.name != node.name:  # Profile one
-                            new_profile_build_requires.append(build_require)
-
+            matching = profile_build_requires.matching(node.ref, consumer)
+            for build_requires in matching:
+                for build_require in build_requires:
+                    if build_require.name in package_build_requires:  # Override defined
+                        # this is a way to have only one package Name for all versions
+                        # (no conflicts)
+                        # but the dict key is not used at all
+                        package_build_requires[build_require.name] = build_require
+                    elif build_require.name != node.name:  # Profile one
+                        new_profile_build_requires.append(build_require)
+
+            # The recipe and the profile build_requires are expanded separately: the profile
+            # build_requires do not apply to the profile build_requires nodes themselves (but they
+            # do to the recipe ones), and the second expansion puts its nodes first in the
+            # closure, which defines the linking order
             if package_build_requires:
                 subgraph = builder.extend_build_requires(graph, node,
                                                          package_build_requires.values(),
@@ -260,7 +346,8 @@ class GraphManager(object):
                 self._recurse_build_requires(graph, subgraph, builder,
                                              check_updates, update, build_mode,
                                              remotes, profile_build_requires, recorder,
-                                             processed_profile, graph_lock)
+                                             processed_profile, graph_lock,
+                                             skip_binaries=skip_binaries)
 
             if new_profile_build_requires:
                 subgraph = builder.extend_build_requires(graph, node, new_profile_build_requires,
@@ -268,12 +355,13 @@ class GraphManager(object):
                                                          processed_profile, graph_lock)
                 self._recurse_build_requires(graph, subgraph, builder,
                                              check_updates, update, build_mode,
-                                             remotes, {}, recorder,
-                                             processed_profile, graph_lock)
+                                             remotes, _NO_PROFILE_BUILD_REQUIRES, recorder,
+                                             processed_profile, graph_lock,
+                                             skip_binaries=skip_binaries)
 
     def _load_graph(self, root_node, check_updates, update, build_mode, remotes,
                     profile_build_requires, recorder, processed_profile, apply_build_requires,
-                    graph_lock):
+                    graph_lock, skip_binaries=False):
 
         assert isinstance(build_mode, BuildMode)
         builder = DepsGraphBuilder(self._proxy, self._output, self._loader, self._resolver,
@@ -281,34 +369,42 @@ class GraphManager(object):
         graph = builder.load_graph(root_node, check_updates, update, remotes, processed_profile,
                                    graph_lock)
 
+        profile_build_requires = _ProfileBuildRequires(profile_build_requires)
         self._recurse_build_requires(graph, graph, builder, check_updates, update, build_mode,
                                      remotes, profile_build_requires, recorder, processed_profile,
-                                     graph_lock, apply_build_requires=apply_build_requires)
+                                     graph_lock, apply_build_requires=apply_build_requires,
+                                     skip_binaries=skip_binaries)
 
         # Sort of closures, for linking order
         inverse_levels = {n: i for i, level in enumerate(graph.inverse_levels()) for n in level}
         for node in graph.nodes:
             closure = node.public_closure
             closure.pop(node.name)
-            node_order = list(closure.values())
-            # List sort is stable, will keep the original order of closure, but prioritize levels
-            node_order.sort(key=lambda n: inverse_levels[n])
-            node.public_closure = node_order
+            # Bucket by level instead of sorting the full closure: keeps the original order of
+            # the closure inside each level, but prioritizes levels
+            node_levels = defaultdict(list)
+            for n in closure.values():
+                node_levels[inverse_levels[n]].append(n)
+            node.public_closure = [n for level in sorted(node_levels) for n in node_levels[level]]
 
         return graph
 
 
-def load_deps_info(current_path, conanfile, required):
+class _InfoObjectNotDefined(object):
+    def __init__(self, field_name):
+        self._field_name = field_name
+
+    def __getitem__(self, item):
+        raise ConanException("self.%s not defined. If you need it for a "
+                             "local command run 'conan install'" % self._field_name)
+    __getattr__ = __getitem__
 
-    def get_forbidden_access_object(field_name):
-        class InfoObjectNotDefined(object):
-            def __getitem__(self, item):
-                raise ConanException("self.%s not defined. If you need it for a "
-                                     "local command run 'conan install'" % field_name)
-            __getattr__ = __getitem__
 
-        return InfoObjectNotDefined()
+_FORBIDDEN_CPP_INFO = _InfoObjectNotDefined("deps_cpp_info")
+_FORBIDDEN_USER_INFO = _InfoObjectNotDefined("deps_user_info")
 
+
+def load_deps_info(current_path, conanfile, required):
     if not current_path:
         return
     info_file_path = os.path.join(current_path, BUILD_INFO)
@@ -322,7 +418,7 @@ def load_deps_info(current_path, conanfile, required):
             raise ConanException("%s file not found in %s\nIt is required for this command\n"
                                  "You can generate it using 'conan install'"
                                  % (BUILD_INFO, current_path))
-        conanfile.deps_cpp_info = get_forbidden_access_object("deps_cpp_info")
-        conanfile.deps_user_info = get_forbidden_access_object("deps_user_info")
+        conanfile.deps_cpp_info = _FORBIDDEN_CPP_INFO
+        conanfile.deps_user_info = _FORBIDDEN_USER_INFO
     except ConanException:
         raise ConanException("Parse error in '%s' file in %s" % (BUILD_INFO, current_path))
@@ -531,9 +531,10 @@ def get_cased_path(name):
 
         child_cased = child
         if os.path.exists(parent):
+            child_upper = child.upper()
             children = os.listdir(parent)
             for c in children:
-                if c.upper() == child.upper():
+                if c.upper() == child_upper:
                     child_cased = c
                     break
         result.append(child_cased)
@@ -208,11 +208,18 @@ class ConanFileReference(namedtuple("ConanFileReference", "name version user cha
         return ConanFileReference(name, version, user, channel)
 
     def __str__(self):
-        if self.name is None and self.version is None:
-            return ""
-        if self.user is None and self.channel is None:
-            return "%s/%s" % (self.name, self.version)
-        return "%s/%s@%s/%s" % (self.name, self.version, self.user, self.channel)
+        # References are immutable and converted to string very often, compute it only once
+        try:
+            return self.__dict__["_str"]
+        except KeyError:
+            if self.name is None and self.version is None:
+                result = ""
+            elif self.user is None and self.channel is None:
+                result = "%s/%s" % (self.name, self.version)
+            else:
+                result = "%s/%s@%s/%s" % (self.name, self.version, self.user, self.channel)
+            self.__dict__["_str"] = result
+            return result
 
     def __repr__(self):
         str_rev = "#%s" % self.revision if self.revision else ""
@@ -63,7 +63,7 @@ class GraphManagerTest(unittest.TestCase):
         manifest.save(self.cache.package_layout(ref).export())
 
     def build_graph(self, content, profile_build_requires=None, ref=None, create_ref=None,
-                    install=True):
+                    install=True, skip_binaries=False, build_mode=None):
         path = temp_folder()
         path = os.path.join(path, "conanfile.py")
         save(path, str(content))
@@ -75,13 +75,14 @@ class GraphManagerTest(unittest.TestCase):
         update = check_updates = False
         recorder = ActionRecorder()
         remotes = Remotes()
-        build_mode = []  # Means build all
+        build_mode = [] if build_mode is None else build_mode  # [] means build all
         ref = ref or ConanFileReference(None, None, None, None, validate=False)
         options = OptionsValues()
         graph_info = GraphInfo(profile, options, root_ref=ref)
         app = self._get_app()
         deps_graph = app.graph_manager.load_graph(path, create_ref, graph_info, build_mode,
-                                                  check_updates, update, remotes, recorder)
+                                                  check_updates, update, remotes, recorder,
+                                                  skip_binaries=skip_binaries)
         if install:
             binary_installer = BinaryInstaller(app, recorder)
             build_mode = BuildMode(build_mode, app.out)
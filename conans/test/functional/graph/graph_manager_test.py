@@ -1,11 +1,17 @@
+import os
+from collections import OrderedDict
+
 import six
 from parameterized import parameterized
 
-from conans.client.graph.graph import RECIPE_CONSUMER, RECIPE_INCACHE
+from conans.client.graph.graph import BINARY_BUILD, BINARY_EDITABLE, BINARY_SKIP, \
+    RECIPE_CONSUMER, RECIPE_INCACHE
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
 from conans.test.functional.graph.graph_manager_base import GraphManagerTest
-from conans.test.utils.tools import GenConanfile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import GenConanfile, NO_SETTINGS_PACKAGE_ID
+from conans.util.files import save
 
 
 class TransitiveGraphTest(GraphManagerTest):
@@ -44,6 +50,59 @@ class TransitiveGraphTest(GraphManagerTest):
         self.assertEqual(app.public_deps, {"app": app, "libb": libb})
         self.assertEqual(libb.public_deps, app.public_deps)
 
+    def test_skip_binaries(self):
+        # app -> libb0.1 (build_require tool0.1), only the package_ids are computed
+        tool_ref = ConanFileReference.loads("tool/0.1@user/testing")
+        libb_ref = ConanFileReference.loads("libb/0.1@user/testing")
+        self._cache_recipe(tool_ref, GenConanfile().with_name("tool").with_version("0.1"))
+        self._cache_recipe(libb_ref, GenConanfile().with_name("libb").with_version("0.1")
+                                                   .with_build_require(tool_ref))
+        deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                    .with_require(libb_ref),
+                                      install=False, skip_binaries=True, build_mode=["never"])
+        self.assertEqual(2, len(deps_graph.nodes))
+        libb = deps_graph.root.dependencies[0].dst
+        self.assertEqual(libb.binary, BINARY_SKIP)
+        self.assertEqual(libb.package_id, NO_SETTINGS_PACKAGE_ID)
+        self.assertEqual(libb.dependencies, [])
+
+    def test_skip_binaries_forced_build(self):
+        # app -> libb0.1 (build_require tool0.1), with --build the build_requires are expanded
+        tool_ref = ConanFileReference.loads("tool/0.1@user/testing")
+        libb_ref = ConanFileReference.loads("libb/0.1@user/testing")
+        self._cache_recipe(tool_ref, GenConanfile().with_name("tool").with_version("0.1"))
+        self._cache_recipe(libb_ref, GenConanfile().with_name("libb").with_version("0.1")
+                                                   .with_build_require(tool_ref))
+        deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                    .with_require(libb_ref),
+                                      install=False, skip_binaries=True)
+        self.assertEqual(3, len(deps_graph.nodes))
+        libb = deps_graph.root.dependencies[0].dst
+        self.assertEqual(libb.binary, BINARY_BUILD)
+        tool = libb.dependencies[0].dst
+        self.assertEqual(tool.ref.copy_clear_rev(), tool_ref)
+        self.assertEqual(tool.binary, BINARY_BUILD)
+
+    def test_skip_binaries_editable(self):
+        # app -> libb0.1 (editable, build_require tool0.1), its build_requires are expanded
+        tool_ref = ConanFileReference.loads("tool/0.1@user/testing")
+        libb_ref = ConanFileReference.loads("libb/0.1@user/testing")
+        self._cache_recipe(tool_ref, GenConanfile().with_name("tool").with_version("0.1"))
+        libb_folder = temp_folder()
+        save(os.path.join(libb_folder, "conanfile.py"),
+             str(GenConanfile().with_name("libb").with_version("0.1")
+                               .with_build_require(tool_ref)))
+        self.cache.editable_packages.add(libb_ref, libb_folder, None)
+        deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                    .with_require(libb_ref),
+                                      install=False, skip_binaries=True, build_mode=["never"])
+        self.assertEqual(3, len(deps_graph.nodes))
+        libb = deps_graph.root.dependencies[0].dst
+        self.assertEqual(libb.binary, BINARY_EDITABLE)
+        tool = libb.dependencies[0].dst
+        self.assertEqual(tool.ref.copy_clear_rev(), tool_ref)
+        self.assertEqual(tool.binary, BINARY_SKIP)
+
     def test_transitive_two_levels(self):
         # app -> libb0.1 -> liba0.1
         liba_ref = ConanFileReference.loads("liba/0.1@user/testing")
@@ -405,6 +464,38 @@ class TransitiveGraphTest(GraphManagerTest):
         self._check_node(mingw_app, "mingw/0.1@user/testing#123", deps=[], build_deps=[],
                          dependents=[app], closure=[])
 
+    def test_build_require_profile_patterns(self):
+        # app -> lib -(br)-> tool
+        # app -(br)-> mingw
+        tool_ref = ConanFileReference.loads("tool/0.1@user/testing")
+        mingw_ref = ConanFileReference.loads("mingw/0.1@user/testing")
+        lib_ref = ConanFileReference.loads("lib/0.1@user/testing")
+
+        self._cache_recipe(tool_ref, GenConanfile().with_name("tool").with_version("0.1"))
+        self._cache_recipe(mingw_ref, GenConanfile().with_name("mingw").with_version("0.1"))
+        self._cache_recipe(lib_ref, GenConanfile().with_name("lib").with_version("0.1"))
+        profile_build_requires = OrderedDict([("lib/0.1@user/testing", [tool_ref]),
+                                              ("lib/0.1@other/*", [mingw_ref]),
+                                              ("&", [mingw_ref])])
+        deps_graph = self.build_graph(GenConanfile().with_name("app").with_version("0.1")
+                                                    .with_require(lib_ref),
+                                      profile_build_requires=profile_build_requires)
+
+        self.assertEqual(4, len(deps_graph.nodes))
+        app = deps_graph.root
+        lib = app.dependencies[0].dst
+        mingw = app.dependencies[1].dst
+        tool = lib.dependencies[0].dst
+
+        self._check_node(app, "app/0.1@", deps=[lib], build_deps=[mingw], dependents=[],
+                         closure=[mingw, lib])
+        self._check_node(lib, "lib/0.1@user/testing#123", deps=[], build_deps=[tool],
+                         dependents=[app], closure=[tool])
+        self._check_node(tool, "tool/0.1@user/testing#123", deps=[], build_deps=[],
+                         dependents=[lib], closure=[])
+        self._check_node(mingw, "mingw/0.1@user/testing#123", deps=[], build_deps=[],
+                         dependents=[app], closure=[])
+
     def test_conflict_transitive_build_requires(self):
         zlib_ref = ConanFileReference.loads("zlib/0.1@user/testing")
         zlib_ref2 = ConanFileReference.loads("zlib/0.2@user/testing")
@@ -1,5 +1,6 @@
 import json
 import os
+import shutil
 import unittest
 from collections import namedtuple
 
@@ -12,7 +13,8 @@ from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.scm import SCMData
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, SVNLocalRepoTestCase, TestClient, \
-    TestServer, create_local_git_repo
+    TestServer, create_local_git_repo, init_git_repo
+from conans.util.env_reader import get_env
 from conans.util.files import load, rmdir, save, to_file_bytes
 
 base = '''
@@ -42,24 +44,47 @@ class ConanLib(ConanFile):
 base_git = base % "git"
 base_svn = base % "svn"
 
+base_subfolder = base.replace('"revision": "{revision}"',
+                              '"revision": "{revision}",\n        "subfolder": "mysub"')
+base_git_subfolder = base_subfolder % "git"
+base_svn_subfolder = base_subfolder % "svn"
+
 
 def _quoted(item):
     return '"{}"'.format(item)
 
 
+def _create_cache_template():
+    """ A client cache with the default profile and settings.yml already created, so the
+    tests copy it instead of initializing (and detecting the default profile) every time
+    """
+    client = TestClient()
+    _ = client.cache.default_profile
+    _ = client.cache.settings
+    return client.cache_folder
+
+
+def _client_from_template(cache_template):
+    cache_folder = os.path.join(temp_folder(), "cache")
+    shutil.copytree(cache_template, cache_folder)
+    return TestClient(cache_folder=cache_folder)
+
+
 @attr('git')
 class GitSCMTest(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super(GitSCMTest, cls).setUpClass()
+        cls._cache_template_folder = _create_cache_template()
+
     def setUp(self):
         self.ref = ConanFileReference.loads("lib/0.1@user/channel")
-        self.client = TestClient()
+        self.client = _client_from_template(self._cache_template_folder)
 
     def _commit_contents(self):
-        self.client.run_command("git init .")
-        self.client.run_command('git config user.email "you@example.com"')
-        self.client.run_command('git config user.name "Your Name"')
-        self.client.run_command("git add .")
-        self.client.run_command('git commit -m  "commiting"')
+        init_git_repo(self.client.current_folder)
+        self.client.run_command('git add . && git commit -m  "commiting"')
 
     def test_scm_other_type_ignored(self):
         conanfile = '''
@@ -109,12 +134,8 @@ class ConanLib(ConanFile):
         conanfile = base_git.format(directory="None", url=_quoted("auto"), revision="auto")
         repo = temp_folder()
         self.client.save({"conanfile.py": conanfile, "myfile.txt": "My file is copied"}, repo)
-        with self.client.chdir(repo):
-            self.client.run_command("git init .")
-            self.client.run_command('git config user.email "you@example.com"')
-            self.client.run_command('git config user.name "Your Name"')
-            self.client.run_command("git add .")
-            self.client.run_command('git commit -m  "commiting"')
+        init_git_repo(repo)
+        self.client.run_command('git add . && git commit -m  "commiting"', cwd=repo)
         self.client.run_command('git clone "%s" .' % repo)
         self.client.run("export . user/channel")
         self.assertIn("WARN: Repo origin looks like a local path", self.client.out)
@@ -160,10 +181,7 @@ class ConanLib(ConanFile):
         self.assertIn("My file is copied", self.client.out)
 
     def test_auto_subfolder(self):
-        conanfile = base_git.replace('"revision": "{revision}"',
-                                     '"revision": "{revision}",\n        '
-                                     '"subfolder": "mysub"')
-        conanfile = conanfile.replace("short_paths = True", "short_paths = False")
+        conanfile = base_git_subfolder.replace("short_paths = True", "short_paths = False")
         conanfile = conanfile.format(directory="None", url=_quoted("auto"), revision="auto")
         self.client.save({"conanfile.py": conanfile, "myfile.txt": "My file is copied"})
         create_local_git_repo(folder=self.client.current_folder)
@@ -188,7 +206,7 @@ class ConanLib(ConanFile):
         # Create the package
         self.client.run("create conan/ user/channel")
         sources_dir = self.client.cache.package_layout(self.ref).scm_folder()
-        self.assertEqual(load(sources_dir), curdir.replace('\\', '/'))  # Root of git is 'curdir'
+        self.assertEqual(load(sources_dir), curdir)  # Root of git is 'curdir'
 
     def test_deleted_source_folder(self):
         path, _ = create_local_git_repo({"myfile": "contents"}, branch="my_release")
@@ -228,13 +246,15 @@ other_folder/excluded_subfolder
         pref = PackageReference(ConanFileReference.loads("lib/0.1@user/channel"),
                                 NO_SETTINGS_PACKAGE_ID)
         bf = self.client.cache.package_layout(pref.ref).build(pref)
-        self.assertTrue(os.path.exists(os.path.join(bf, "myfile.txt")))
-        self.assertTrue(os.path.exists(os.path.join(bf, "myfile")))
-        self.assertTrue(os.path.exists(os.path.join(bf, ".git")))
-        self.assertFalse(os.path.exists(os.path.join(bf, "ignored.pyc")))
-        self.assertFalse(os.path.exists(os.path.join(bf, "my_excluded_folder")))
-        self.assertTrue(os.path.exists(os.path.join(bf, "other_folder", "valid_file")))
-        self.assertFalse(os.path.exists(os.path.join(bf, "other_folder", "excluded_subfolder")))
+        build_files = os.listdir(bf)
+        self.assertIn("myfile.txt", build_files)
+        self.assertIn("myfile", build_files)
+        self.assertIn(".git", build_files)
+        self.assertNotIn("ignored.pyc", build_files)
+        self.assertNotIn("my_excluded_folder", build_files)
+        other_files = os.listdir(os.path.join(bf, "other_folder"))
+        self.assertIn("valid_file", other_files)
+        self.assertNotIn("excluded_subfolder", other_files)
 
     def test_local_source(self):
         curdir = self.client.current_folder.replace("\\", "/")
@@ -256,8 +276,8 @@ other_folder/excluded_subfolder
                       str(self.client.out).replace("\\", "/"))
 
         # Export again but now with absolute reference, so no pointer file is created nor kept
-        git = Git(curdir.replace("\\", "/"))
-        conanfile = base_git.format(url=_quoted(curdir.replace("\\", "/")),
+        git = Git(curdir)
+        conanfile = base_git.format(url=_quoted(curdir),
                                     revision=git.get_revision())
         conanfile += """
     def source(self):
@@ -265,20 +285,18 @@ other_folder/excluded_subfolder
 """
         self.client.save({"conanfile.py": conanfile,
                           "myfile2.txt": "My file is copied"})
-        create_local_git_repo(folder=self.client.current_folder)
+        git.run("add .")
+        git.run('commit -m "commiting"')
         self.client.run("source . --source-folder=./source2")
         # myfile2 is no in the specified commit
         self.assertFalse(os.path.exists(os.path.join(curdir, "source2", "myfile2.txt")))
         self.assertTrue(os.path.exists(os.path.join(curdir, "source2", "myfile.txt")))
-        self.assertIn("Getting sources from url: '%s'" % curdir.replace("\\", "/"), self.client.out)
+        self.assertIn("Getting sources from url: '%s'" % curdir, self.client.out)
         self.assertIn("SOURCE METHOD CALLED", self.client.out)
 
     def test_local_source_subfolder(self):
         curdir = self.client.current_folder
-        conanfile = base_git.replace('"revision": "{revision}"',
-                                     '"revision": "{revision}",\n        '
-                                     '"subfolder": "mysub"')
-        conanfile = conanfile.format(url=_quoted("auto"), revision="auto")
+        conanfile = base_git_subfolder.format(url=_quoted("auto"), revision="auto")
         conanfile += """
     def source(self):
         self.output.warn("SOURCE METHOD CALLED")
@@ -306,6 +324,9 @@ other_folder/excluded_subfolder
                                                 files={"conans/model/username.py": "foo"})
             if revision is None:  # Get the generated commit
                 revision = rev
+        else:
+            # A local mirror ("file://" URL, git clone --mirror) avoids cloning from the network
+            remote = get_env("CONAN_TEST_GITHUB_CONAN_MIRROR", remote)
 
         # Use explicit URL to avoid local optimization (scm_folder.txt)
         conanfile = '''
@@ -376,14 +397,11 @@ class ConanLib(ConanFile):
         path, commit = create_local_git_repo({"myfile": "contents"}, branch="my_release",
                                              submodules=[submodule])
 
-        def _relative_paths(folder):
-            submodule_path = os.path.join(
-                folder,
-                os.path.basename(os.path.normpath(submodule)))
-            subsubmodule_path = os.path.join(
-                submodule_path,
-                os.path.basename(os.path.normpath(subsubmodule)))
-            return submodule_path, subsubmodule_path
+        # All the cases create the same reference, so they share the cache source folder
+        folder = self.client.cache.package_layout(self.ref).source()
+        submodule_path = os.path.join(folder, os.path.basename(os.path.normpath(submodule)))
+        subsubmodule_path = os.path.join(submodule_path,
+                                         os.path.basename(os.path.normpath(subsubmodule)))
 
         # Check old (default) behaviour
         tmp = '''
@@ -402,9 +420,6 @@ class ConanLib(ConanFile):
         self.client.save({"conanfile.py": conanfile})
         self.client.run("create . user/channel")
 
-        ref = ConanFileReference.loads("lib/0.1@user/channel")
-        folder = self.client.cache.package_layout(ref).source()
-        submodule_path, _ = _relative_paths(folder)
         self.assertTrue(os.path.exists(os.path.join(folder, "myfile")))
         self.assertFalse(os.path.exists(os.path.join(submodule_path, "submodule")))
 
@@ -434,9 +449,6 @@ class ConanLib(ConanFile):
         self.client.save({"conanfile.py": conanfile})
         self.client.run("create . user/channel")
 
-        ref = ConanFileReference.loads("lib/0.1@user/channel")
-        folder = self.client.cache.package_layout(ref).source()
-        submodule_path, subsubmodule_path = _relative_paths(folder)
         self.assertTrue(os.path.exists(os.path.join(folder, "myfile")))
         self.assertTrue(os.path.exists(os.path.join(submodule_path, "submodule")))
         self.assertFalse(os.path.exists(os.path.join(subsubmodule_path, "subsubmodule")))
@@ -446,9 +458,6 @@ class ConanLib(ConanFile):
         self.client.save({"conanfile.py": conanfile})
         self.client.run("create . user/channel")
 
-        ref = ConanFileReference.loads("lib/0.1@user/channel")
-        folder = self.client.cache.package_layout(ref).source()
-        submodule_path, subsubmodule_path = _relative_paths(folder)
         self.assertTrue(os.path.exists(os.path.join(folder, "myfile")))
         self.assertTrue(os.path.exists(os.path.join(submodule_path, "submodule")))
         self.assertTrue(os.path.exists(os.path.join(subsubmodule_path, "subsubmodule")))
@@ -601,9 +610,14 @@ class MyLib(ConanFile):
 @attr('svn')
 class SVNSCMTest(SVNLocalRepoTestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super(SVNSCMTest, cls).setUpClass()
+        cls._cache_template_folder = _create_cache_template()
+
     def setUp(self):
         self.ref = ConanFileReference.loads("lib/0.1@user/channel")
-        self.client = TestClient()
+        self.client = _client_from_template(self._cache_template_folder)
 
     def _commit_contents(self):
         self.client.run_command("svn add *")
@@ -661,7 +675,6 @@ class ConanLib(ConanFile):
         conanfile = base_svn.format(directory="None", url=_quoted("auto"), revision="auto")
         project_url, _ = self.create_project(files={"conanfile.py": conanfile,
                                                     "myfile.txt": "My file is copied"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
 
@@ -690,15 +703,11 @@ class ConanLib(ConanFile):
         self.assertIn("My file is copied", self.client.out)
 
     def test_auto_subfolder(self):
-        conanfile = base_svn.replace('"revision": "{revision}"',
-                                     '"revision": "{revision}",\n        '
-                                     '"subfolder": "mysub"')
-        conanfile = conanfile.replace("short_paths = True", "short_paths = False")
+        conanfile = base_svn_subfolder.replace("short_paths = True", "short_paths = False")
         conanfile = conanfile.format(directory="None", url=_quoted("auto"), revision="auto")
 
         project_url, _ = self.create_project(files={"conanfile.py": conanfile,
                                                     "myfile.txt": "My file is copied"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
         self.client.run("create . user/channel")
@@ -737,7 +746,6 @@ class ConanLib(ConanFile):
                                                     # ".gitignore": "*.pyc\n",
                                                     "myfile.txt": "My file!",
                                                     "conanfile.py": conanfile})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
 
@@ -746,10 +754,11 @@ class ConanLib(ConanFile):
         pref = PackageReference(ConanFileReference.loads("lib/0.1@user/channel"),
                                 NO_SETTINGS_PACKAGE_ID)
         bf = self.client.cache.package_layout(pref.ref).build(pref)
-        self.assertTrue(os.path.exists(os.path.join(bf, "myfile.txt")))
-        self.assertTrue(os.path.exists(os.path.join(bf, "myfile")))
-        self.assertTrue(os.path.exists(os.path.join(bf, ".svn")))
-        self.assertFalse(os.path.exists(os.path.join(bf, "ignored.pyc")))
+        build_files = os.listdir(bf)
+        self.assertIn("myfile.txt", build_files)
+        self.assertIn("myfile", build_files)
+        self.assertIn(".svn", build_files)
+        self.assertNotIn("ignored.pyc", build_files)
 
     def test_local_source(self):
         curdir = self.client.current_folder.replace("\\", "/")
@@ -760,7 +769,6 @@ class ConanLib(ConanFile):
 """
         project_url, _ = self.create_project(files={"conanfile.py": conanfile,
                                                     "myfile.txt": "My file is copied"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
         self.client.save({"aditional_file.txt": "contents"})
@@ -792,17 +800,13 @@ class ConanLib(ConanFile):
 
     def test_local_source_subfolder(self):
         curdir = self.client.current_folder
-        conanfile = base_svn.replace('"revision": "{revision}"',
-                                     '"revision": "{revision}",\n        '
-                                     '"subfolder": "mysub"')
-        conanfile = conanfile.format(url=_quoted("auto"), revision="auto")
+        conanfile = base_svn_subfolder.format(url=_quoted("auto"), revision="auto")
         conanfile += """
     def source(self):
         self.output.warn("SOURCE METHOD CALLED")
 """
         project_url, _ = self.create_project(files={"conanfile.py": conanfile,
                                                     "myfile.txt": "My file is copied"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
 
@@ -819,7 +823,6 @@ class ConanLib(ConanFile):
         conanfile = base_svn.format(url=_quoted("auto"), revision="auto")
         project_url, _ = self.create_project(files={"conanfile.py": conanfile,
                                                     "myfile.txt": "My file is copied"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
         self.client.run("export . lasote/channel")
@@ -848,7 +851,6 @@ class ConanLib(ConanFile):
 '''
         project_url, _ = self.create_project(files={"myfile": "contents",
                                                     "conanfile.py": conanfile})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
 
@@ -866,7 +868,6 @@ class ConanLib(ConanFile):
 
     def test_source_method_export_sources_and_scm_mixed(self):
         project_url, rev = self.create_project(files={"myfile": "contents"})
-        project_url = project_url.replace(" ", "%20")
         self.client.run_command('svn co "{url}" "{path}"'.format(url=project_url,
                                                                  path=self.client.current_folder))
 
@@ -911,7 +912,6 @@ class SCMSVNWithLockedFilesTest(SVNLocalRepoTestCase):
 
         conanfile = base_svn.format(directory="None", url=_quoted("auto"), revision="auto")
         project_url, _ = self.create_project(files={"conanfile.py": conanfile})
-        project_url = project_url.replace(" ", "%20")
 
         # Add property needs-lock to my own copy
         client = TestClient()
@@ -0,0 +1,30 @@
+import unittest
+
+import six
+
+from conans.client.graph.graph_manager import load_deps_info
+from conans.errors import ConanException
+from conans.test.utils.test_files import temp_folder
+
+
+class LoadDepsInfoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+
+    @staticmethod
+    def _conanfile():
+        class ConanfileMock(object):
+            pass
+        return ConanfileMock()
+
+    def test_not_installed(self):
+        conanfile = self._conanfile()
+        load_deps_info(self.folder, conanfile, required=False)
+        with six.assertRaisesRegex(self, ConanException, "self.deps_cpp_info not defined"):
+            conanfile.deps_cpp_info.libs
+        with six.assertRaisesRegex(self, ConanException, "self.deps_user_info not defined"):
+            conanfile.deps_user_info["zlib"]
+
+        with six.assertRaisesRegex(self, ConanException, "conanbuildinfo.txt file not found"):
+            load_deps_info(self.folder, conanfile, required=True)
@@ -107,6 +107,17 @@ class RefTest(unittest.TestCase):
         self.assertTrue(ref == ref2)
         self.assertFalse(ref != ref2)
 
+    def str_cached_test(self):
+        ref = ConanFileReference.loads("opencv/2.4.10@lasote/testing#23")
+        self.assertEqual(str(ref), "opencv/2.4.10@lasote/testing")
+        self.assertEqual(str(ref), "opencv/2.4.10@lasote/testing")
+        # The cached string is not part of the reference value
+        ref2 = ConanFileReference.loads("opencv/2.4.10@lasote/testing#23")
+        self.assertEqual(ref, ref2)
+        self.assertEqual(hash(ref), hash(ref2))
+        self.assertEqual(str(ref.copy_clear_rev()), "opencv/2.4.10@lasote/testing")
+        self.assertEqual(str(ConanFileReference.loads("opencv/2.4.10")), "opencv/2.4.10")
+
 
 class ConanNameTestCase(unittest.TestCase):
 
@@ -45,6 +45,7 @@ from conans.model.profile import Profile
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.settings import Settings
 from conans.server.revision_list import _RevisionEntry
+from conans.test import CONAN_TEST_FOLDER
 from conans.test.utils.server_launcher import (TESTING_REMOTE_PRIVATE_PASS,
                                                TESTING_REMOTE_PRIVATE_USER,
                                                TestServerLauncher)
@@ -489,15 +490,37 @@ class TestBufferConanOutput(ConanOutput):
         return value in self.__repr__()
 
 
+_git_repo_template = None
+
+
+def init_git_repo(folder):
+    """ Same as 'git init' + configuring the user, but copying a template '.git' folder that is
+    created only once, instead of launching those git processes for every new repository
+    """
+    def _init(git):
+        git.run("init .")
+        git.run('config user.email "you@example.com"')
+        git.run('config user.name "Your Name"')
+
+    if os.path.exists(os.path.join(folder, ".git")):  # Reinitialize an existing repository
+        _init(Git(folder))
+        return
+
+    global _git_repo_template
+    if _git_repo_template is None:
+        template = temp_folder()
+        _init(Git(template))
+        _git_repo_template = os.path.join(template, ".git")
+    shutil.copytree(_git_repo_template, os.path.join(folder, ".git"))
+
+
 def create_local_git_repo(files=None, branch=None, submodules=None, folder=None, commits=1, tags=None):
     tmp = folder or temp_folder()
     tmp = get_cased_path(tmp)
     if files:
         save_files(tmp, files)
+    init_git_repo(tmp)
     git = Git(tmp)
-    git.run("init .")
-    git.run('config user.email "you@example.com"')
-    git.run('config user.name "Your Name"')
 
     if branch:
         git.run("checkout -b %s" % branch)
@@ -566,10 +589,16 @@ def try_remove_readonly(func, path, exc):  # TODO: May promote to conan tools?
 
 class SVNLocalRepoTestCase(unittest.TestCase):
     path_with_spaces = True
+    _repo_template = None  # Empty repository, created once and copied for every test
 
     def _create_local_svn_repo(self):
         folder = os.path.join(self._tmp_folder, 'repo_server')
-        return create_remote_svn_repo(folder)
+        if SVNLocalRepoTestCase._repo_template is None:
+            template = os.path.join(temp_folder(), 'repo_server')
+            create_remote_svn_repo(template)
+            SVNLocalRepoTestCase._repo_template = template
+        shutil.copytree(SVNLocalRepoTestCase._repo_template, folder)
+        return SVN.file_protocol + quote(folder.replace("\\", "/"), safe='/:')
 
     def gimme_tmp(self, create=True):
         tmp = os.path.join(self._tmp_folder, str(uuid.uuid4()))
@@ -585,7 +614,7 @@ class SVNLocalRepoTestCase(unittest.TestCase):
                                          folder=tmp_dir)
 
     def run(self, *args, **kwargs):
-        tmp_folder = tempfile.mkdtemp(suffix='_conans')
+        tmp_folder = tempfile.mkdtemp(suffix='_conans', dir=CONAN_TEST_FOLDER)
         try:
             self._tmp_folder = os.path.join(tmp_folder, 'path with spaces'
                                             if self.path_with_spaces else 'pathwithoutspaces')